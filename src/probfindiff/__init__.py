@@ -7,8 +7,10 @@ from ._toplevel_api import (
     central,
     differentiate,
     differentiate_along_axis,
+    finalize,
     forward,
     from_grid,
+    from_grid_batched,
 )
 from ._version import version as __version__
 
@@ -20,4 +22,6 @@ __all__ = [
     "backward",
     "central",
     "from_grid",
+    "from_grid_batched",
+    "finalize",
 ]
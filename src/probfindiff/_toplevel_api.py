@@ -2,8 +2,7 @@
 
 import functools
 from collections import namedtuple
-from functools import partial
-from typing import Any, Optional
+from typing import Any, Callable, Optional, Tuple
 
 import jax
 import jax.numpy as jnp
@@ -27,8 +26,13 @@ A finite difference scheme consists of a weight-vector, marginal covariances, an
 """
 
 
-@jax.jit
-def differentiate(fx: ArrayLike, *, scheme: FiniteDifferenceScheme) -> ArrayLike:
+@functools.partial(jax.jit, static_argnames=("precision",))
+def differentiate(
+    fx: ArrayLike,
+    *,
+    scheme: FiniteDifferenceScheme,
+    precision: Optional[jax.lax.Precision] = None,
+) -> ArrayLike:
     """Apply a finite difference scheme to a vector of function evaluations.
 
     Parameters
@@ -37,6 +41,9 @@ def differentiate(fx: ArrayLike, *, scheme: FiniteDifferenceScheme) -> ArrayLike
         Array of function evaluated to be differentiated numerically. Shape ``(n,)``.
     scheme
         PN finite difference schemes.
+    precision
+        Precision of the contraction of weights and function evaluations (see :class:`jax.lax.Precision`).
+        On accelerators, the default precision may use reduced-precision arithmetic.
 
 
     Returns
@@ -45,12 +52,32 @@ def differentiate(fx: ArrayLike, *, scheme: FiniteDifferenceScheme) -> ArrayLike
         Finite difference approximation and the corresponding base-uncertainty. Shapes `` (n,), (n,)``.
     """
     weights, unc_base, *_ = scheme
-    dfx = jnp.einsum("...k,...k->...", weights, fx)
+    dfx = _apply_weights(weights, fx, precision=precision)
     return dfx, unc_base
 
 
+def _apply_weights(
+    weights: ArrayLike, fx: ArrayLike, *, precision: Optional[jax.lax.Precision]
+) -> ArrayLike:
+    if weights.ndim > 1:
+        return jnp.einsum("...k,...k->...", weights, fx, precision=precision)
+
+    # A single weight-vector contracts the final axis of fx.
+    dtype = jnp.result_type(fx, weights)
+    fx, weights = jnp.asarray(fx, dtype=dtype), jnp.asarray(weights, dtype=dtype)
+    dimension_numbers = (((fx.ndim - 1,), (0,)), ((), ()))
+    return jax.lax.dot_general(
+        fx, weights, dimension_numbers=dimension_numbers, precision=precision
+    )
+
+
+@functools.partial(jax.jit, static_argnames=("axis", "precision"))
 def differentiate_along_axis(
-    fx: ArrayLike, *, axis: int, scheme: FiniteDifferenceScheme
+    fx: ArrayLike,
+    *,
+    axis: int,
+    scheme: FiniteDifferenceScheme,
+    precision: Optional[jax.lax.Precision] = None,
 ) -> ArrayLike:
     """Apply a finite difference scheme along a specified axis.
 
@@ -62,18 +89,176 @@ def differentiate_along_axis(
         Axis along which the scheme should be applied.
     scheme
         PN finite difference schemes.
+    precision
+        Precision of the contraction of weights and function evaluations. See :func:`differentiate`.
 
 
     Returns
     -------
     :
-        Finite difference approximation and the corresponding base-uncertainty. Shapes `` (..., n, ...), (n,)``.
+        Finite difference approximation and the corresponding base-uncertainty.
+        Both have the shape of ``fx`` without ``axis``.
     """
+    dfx, unc_base = differentiate(
+        jnp.moveaxis(fx, axis, -1), scheme=scheme, precision=precision
+    )
+    return dfx, jnp.broadcast_to(unc_base, dfx.shape)
+
+
+_CLOSED_FORM_WEIGHTS = {
+    ("backward", 1, 2): (3.0 / 2.0, -2.0, 1.0 / 2.0),
+    ("backward", 1, 3): (11.0 / 6.0, -3.0, 3.0 / 2.0, -1.0 / 3.0),
+    ("backward", 2, 2): (2.0, -5.0, 4.0, -1.0),
+    ("forward", 1, 2): (-3.0 / 2.0, 2.0, -1.0 / 2.0),
+    ("forward", 1, 3): (-11.0 / 6.0, 3.0, -3.0 / 2.0, 1.0 / 3.0),
+    ("forward", 2, 2): (2.0, -5.0, 4.0, -1.0),
+    ("central", 1, 2): (-1.0 / 2.0, 0.0, 1.0 / 2.0),
+    ("central", 2, 2): (1.0, -2.0, 1.0),
+}
+"""Weights of noise-free schemes with the default kernel, keyed by ``(stencil, order_derivative, order_method)``.
+
+The default kernel is a polynomial kernel whose degree matches the number of grid-points,
+so without observation noise, the schemes coincide with the traditional finite difference schemes
+and the base uncertainty vanishes. The weights refer to ``dx=1``.
+"""
+
+
+def finalize(*schemes: Any) -> Any:
+    """Wait until the computation of finite difference schemes has finished.
+
+    JAX dispatches computations asynchronously,
+    so :func:`backward`, :func:`forward`, :func:`central`, and :func:`from_grid`
+    return before their coefficients have been computed.
+    Computing a few schemes in a row and blocking only once, via this function,
+    lets the computations overlap.
+    Usually, this is only relevant for benchmarks,
+    because every subsequent use of the schemes waits for the coefficients anyway.
 
-    fd = partial(differentiate, scheme=scheme)
-    return jnp.apply_along_axis(fd, axis=axis, arr=fx)
+    Parameters
+    ----------
+    *schemes
+        Finite difference schemes (and grids) as returned by the scheme constructors.
+
+    Returns
+    -------
+    :
+        The schemes, once they are ready.
+        A single scheme is returned as is, multiple schemes as a tuple.
+    """
+    schemes = jax.block_until_ready(schemes)  # type: ignore[no-untyped-call]
+    if len(schemes) == 1:
+        return schemes[0]
+    return schemes
+
+
+def _closed_form_if_available(
+    kind: str, stencil_fun: Callable[..., Any], *, order_method_default: int
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Skip the kernel-solve for the schemes in :data:`_CLOSED_FORM_WEIGHTS`.
+
+    The closed form is only used if it is exact, i.e.,
+    for the default kernel and a (concrete) zero noise variance.
+    The stencil is identified by ``kind``, which must match the keys of the table.
+    """
 
+    def decorator(fun: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(fun)
+        def fun_closed_form(
+            *,
+            dx: float,
+            order_derivative: int = defaults.ORDER_DERIVATIVE,
+            order_method: int = order_method_default,
+            kernel: Optional[KernelFunctionLike] = None,
+            noise_variance: float = defaults.NOISE_VARIANCE,
+        ) -> Any:
+            key = (kind, order_derivative, order_method)
+            is_exact = (
+                kernel is None
+                and not isinstance(noise_variance, jax.core.Tracer)
+                and noise_variance == 0.0
+            )
+            if is_exact and key in _CLOSED_FORM_WEIGHTS:
+                grid = stencil_fun(
+                    dx=dx, order_derivative=order_derivative, order_method=order_method
+                )
+                weights = jnp.asarray(_CLOSED_FORM_WEIGHTS[key]) / dx**order_derivative
+                scheme = FiniteDifferenceScheme(
+                    weights,
+                    jnp.zeros(()),
+                    order_derivative=jnp.asarray(order_derivative),
+                )
+                return scheme, grid
+            return fun(
+                dx=dx,
+                order_derivative=order_derivative,
+                order_method=order_method,
+                kernel=kernel,
+                noise_variance=noise_variance,
+            )
+
+        return fun_closed_form
+
+    return decorator
+
+
+class _TracedResult(Exception):
+    """Carry a traced result past the cache of :func:`_memoise_scheme`."""
+
+    def __init__(self, result: Any) -> None:
+        super().__init__()
+        self.result = result
+
+
+def _memoise_scheme(fun: Callable[..., Any]) -> Callable[..., Any]:
+    """Memoise a scheme-constructor on the step-size and all other arguments.
+
+    Time-stepping loops tend to request the same scheme at every step.
+    Memoising skips the kernel-solve for repeated requests.
+    The cache is keyed on the exact step-size and on the default floating-point type,
+    which changes with ``jax_enable_x64``.
+    Traced step-sizes or noise variances (e.g. inside a ``jax.jit``)
+    bypass the cache. Concrete arguments are evaluated at compile time.
+    Results that are traced nonetheless, for instance because the kernel
+    closes over a traced hyperparameter, are returned but not cached.
+    """
 
+    @functools.lru_cache(maxsize=128)
+    def fun_cached(*, dtype_float: Any, **kwargs: Any) -> Any:
+        del dtype_float  # only part of the cache key
+        with jax.ensure_compile_time_eval():
+            result = fun(**kwargs)
+        if any(
+            isinstance(a, jax.core.Tracer) for a in jax.tree_util.tree_leaves(result)
+        ):
+            # lru_cache does not store results of calls that raise.
+            raise _TracedResult(result)
+        return result
+
+    @functools.wraps(fun)
+    def fun_memoised(
+        *, dx: float, noise_variance: float = defaults.NOISE_VARIANCE, **kwargs: Any
+    ) -> Any:
+        if isinstance(dx, jax.core.Tracer) or isinstance(
+            noise_variance, jax.core.Tracer
+        ):
+            return fun(dx=dx, noise_variance=noise_variance, **kwargs)
+        try:
+            return fun_cached(
+                dtype_float=jnp.result_type(float),
+                dx=float(dx),
+                noise_variance=float(noise_variance),
+                **kwargs,
+            )
+        except _TracedResult as traced:
+            return traced.result
+
+    return fun_memoised
+
+
+@_closed_form_if_available(
+    "backward", stencil.backward, order_method_default=defaults.ORDER_METHOD
+)
+@_memoise_scheme
 @functools.partial(
     jax.jit, static_argnames=("order_derivative", "order_method", "kernel")
 )
@@ -104,6 +289,15 @@ def backward(
     -------
     :
         Finite difference coefficients and base uncertainty.
+
+    Notes
+    -----
+    For the default kernel and ``noise_variance=0.0``, the coefficients of
+    common derivative- and method-orders are not computed by collocation,
+    but taken from the (exact) traditional finite difference schemes.
+    The default noise variance is not zero, so the default call uses collocation.
+    Its coefficients differ from the traditional ones by the effect of the small noise
+    and by round-off errors, and its base uncertainty is not exactly zero.
     """
     grid = stencil.backward(
         dx=dx, order_derivative=order_derivative, order_method=order_method
@@ -117,6 +311,10 @@ def backward(
     return scheme, grid
 
 
+@_closed_form_if_available(
+    "forward", stencil.forward, order_method_default=defaults.ORDER_METHOD
+)
+@_memoise_scheme
 @functools.partial(
     jax.jit, static_argnames=("order_derivative", "order_method", "kernel")
 )
@@ -147,6 +345,15 @@ def forward(
     -------
     :
         Finite difference coefficients and base uncertainty.
+
+    Notes
+    -----
+    For the default kernel and ``noise_variance=0.0``, the coefficients of
+    common derivative- and method-orders are not computed by collocation,
+    but taken from the (exact) traditional finite difference schemes.
+    The default noise variance is not zero, so the default call uses collocation.
+    Its coefficients differ from the traditional ones by the effect of the small noise
+    and by round-off errors, and its base uncertainty is not exactly zero.
     """
     grid = stencil.forward(
         dx=dx, order_derivative=order_derivative, order_method=order_method
@@ -160,6 +367,10 @@ def forward(
     return scheme, grid
 
 
+@_closed_form_if_available(
+    "central", stencil.central, order_method_default=defaults.ORDER_METHOD_CENTRAL
+)
+@_memoise_scheme
 @functools.partial(
     jax.jit, static_argnames=("order_derivative", "order_method", "kernel")
 )
@@ -190,6 +401,15 @@ def central(
     -------
     :
         Finite difference coefficients and base uncertainty.
+
+    Notes
+    -----
+    For the default kernel and ``noise_variance=0.0``, the coefficients of
+    common derivative- and method-orders are not computed by collocation,
+    but taken from the (exact) traditional finite difference schemes.
+    The default noise variance is not zero, so the default call uses collocation.
+    Its coefficients differ from the traditional ones by the effect of the small noise
+    and by round-off errors, and its base uncertainty is not exactly zero.
     """
     grid = stencil.central(
         dx=dx, order_derivative=order_derivative, order_method=order_method
@@ -203,7 +423,6 @@ def central(
     return scheme, grid
 
 
-@functools.partial(jax.jit, static_argnames=("order_derivative", "kernel"))
 def from_grid(
     *,
     xs: ArrayLike,
@@ -231,9 +450,29 @@ def from_grid(
     """
     if kernel is None:
         kernel = defaults.kernel(min_order=xs.shape[0])
-    L = functools.reduce(autodiff.compose, [autodiff.derivative] * order_derivative)
-    ks = kernel_module.differentiate(k=kernel, L=L)
+    ks = _differentiate_kernel(kernel, order_derivative)
+    return _from_grid(
+        xs=xs,
+        ks=ks,
+        order_derivative=order_derivative,
+        noise_variance=noise_variance,
+    )
+
 
+@functools.partial(jax.jit, static_argnames=("ks", "order_derivative"))
+def _from_grid(
+    *,
+    xs: ArrayLike,
+    ks: Tuple[KernelFunctionLike, KernelFunctionLike, KernelFunctionLike],
+    order_derivative: int,
+    noise_variance: float,
+) -> Any:
+    """Finite difference coefficients based on a grid and differentiated kernels.
+
+    The kernel functions are resolved by :func:`from_grid`, outside of this
+    compiled function, so the compilation cache is keyed on
+    the (memoised) differentiated kernels instead of the user-facing arguments.
+    """
     x = jnp.zeros_like(xs[0])
     weights, cov_marginal = collocation.non_uniform_nd(
         x=x[..., None],
@@ -247,3 +486,98 @@ def from_grid(
         order_derivative=order_derivative,
     )
     return scheme
+
+
+def from_grid_batched(  # pylint: disable=too-many-arguments
+    *,
+    xs: ArrayLike,
+    order_derivative: int = defaults.ORDER_DERIVATIVE,
+    kernel: Optional[KernelFunctionLike] = None,
+    noise_variance: float = defaults.NOISE_VARIANCE,
+    cholesky: bool = False,
+    chunk_size: Optional[int] = None,
+) -> Any:
+    """Finite difference coefficients for a batch of grids.
+
+    All Gram matrices are stacked and solved at once,
+    which is more efficient than calling :func:`from_grid` for each grid.
+    For instance, the schemes for a stencil with offsets ``offsets`` and a range of
+    step-sizes ``dxs`` are computed via ``from_grid_batched(xs=dxs[:, None] * offsets[None, :])``.
+
+    Parameters
+    ----------
+    order_derivative
+        Order of the derivative.
+    xs
+        Batch of grids. Shape ``(B, n)``.
+    kernel
+        Kernel function. Defines the function-model.
+    noise_variance
+        Variance of the observation noise.
+    cholesky
+        Whether to solve the linear systems with Cholesky factorisations.
+        This requires numerically positive definite Gram matrices, i.e., a sufficiently large noise variance.
+    chunk_size
+        If provided, only ``chunk_size`` Gram matrices are held in memory at the same time.
+        This bounds the memory of very large batches.
+
+    Returns
+    -------
+    :
+        Finite difference coefficients and base uncertainties. Shapes ``(B, n)``, ``(B,)``.
+    """
+    if kernel is None:
+        kernel = defaults.kernel(min_order=xs.shape[-1])
+    ks = _differentiate_kernel(kernel, order_derivative)
+    return _from_grid_batched(
+        xs=xs,
+        ks=ks,
+        order_derivative=order_derivative,
+        noise_variance=noise_variance,
+        cholesky=cholesky,
+        chunk_size=chunk_size,
+    )
+
+
+@functools.partial(
+    jax.jit, static_argnames=("ks", "order_derivative", "cholesky", "chunk_size")
+)
+def _from_grid_batched(  # pylint: disable=too-many-arguments
+    *,
+    xs: ArrayLike,
+    ks: Tuple[KernelFunctionLike, KernelFunctionLike, KernelFunctionLike],
+    order_derivative: int,
+    noise_variance: float,
+    cholesky: bool,
+    chunk_size: Optional[int],
+) -> Any:
+    """Finite difference coefficients based on a batch of grids and differentiated kernels."""
+    x = jnp.zeros_like(xs[:, 0])
+    weights, cov_marginal = collocation.non_uniform_nd_batched(
+        x=x[..., None],
+        xs=xs[..., None],
+        ks=ks,
+        noise_variance=noise_variance,
+        cholesky=cholesky,
+        chunk_size=chunk_size,
+    )
+    scheme = FiniteDifferenceScheme(
+        weights,
+        cov_marginal,
+        order_derivative=order_derivative,
+    )
+    return scheme
+
+
+@functools.lru_cache(maxsize=32)
+def _differentiate_kernel(
+    kernel: KernelFunctionLike, order_derivative: int
+) -> Tuple[KernelFunctionLike, KernelFunctionLike, KernelFunctionLike]:
+    """Differentiate a kernel function with the ``order_derivative``-th derivative.
+
+    The result is memoised. Reusing the same (jitted) kernel functions keeps the
+    compilation cache of :func:`collocation.non_uniform_nd` warm,
+    because it treats them as static arguments.
+    """
+    L = functools.partial(autodiff.nth_derivative, order=order_derivative)
+    return kernel_module.differentiate(k=kernel, L=L)
@@ -1,10 +1,11 @@
 """Finite differences and collocation with Gaussian processes."""
 
 import functools
-from typing import Any, Tuple
+from typing import Any, Optional, Tuple
 
 import jax
 import jax.numpy as jnp
+import jax.scipy.linalg
 
 from probfindiff.typing import ArrayLike, KernelFunctionLike
 
@@ -19,6 +20,10 @@ def non_uniform_nd(
 ) -> Tuple[Any, Any]:
     r"""Finite difference coefficients for non-uniform data in multiple dimensions.
 
+    The kernel functions are static arguments, which are hashed by identity.
+    Reuse the same triple across calls (as :func:`probfindiff.from_grid` does)
+    to avoid recompiling this function.
+
     Parameters
     ----------
     x
@@ -40,6 +45,79 @@ def non_uniform_nd(
     return unsymmetric(K=K, LK0=LK, LLK=LLK, noise_variance=noise_variance)
 
 
+@functools.partial(jax.jit, static_argnames=("ks", "cholesky", "chunk_size"))
+def non_uniform_nd_batched(  # pylint: disable=too-many-arguments
+    *,
+    x: ArrayLike,
+    xs: ArrayLike,
+    ks: Tuple[KernelFunctionLike, KernelFunctionLike, KernelFunctionLike],
+    noise_variance: float,
+    cholesky: bool = False,
+    chunk_size: Optional[int] = None,
+) -> Tuple[Any, Any]:
+    r"""Finite difference coefficients for a batch of non-uniform neighbourhoods.
+
+    The Gram matrices of all neighbourhoods are stacked,
+    and the weights are computed with a single batched linear solve.
+    For very large batches, the stacked Gram matrices may not fit into memory.
+    Then, pass a ``chunk_size``, and the batch is processed sequentially,
+    ``chunk_size`` neighbourhoods at a time.
+
+    Parameters
+    ----------
+    x
+        Where to compute the finite difference approximations. Shape ``(B, d)``.
+    ks
+        Triple of kernel functions (:math:`\tilde k`, :math:`\tilde L k`, :math:`\tilde L L^*k`)
+    xs
+        Neighbourhoods. Shape ``(B, N, d)``.
+    noise_variance
+        Variance of the observation noise.
+    cholesky
+        Whether to solve the linear systems with Cholesky factorisations. See :func:`unsymmetric`.
+    chunk_size
+        Number of neighbourhoods whose Gram matrices are held in memory at the same time.
+        If ``None``, all Gram matrices are assembled at once.
+
+    Returns
+    -------
+    :
+        Weights and base-uncertainties. Shapes ``(B, N)``, ``(B,)``.
+
+    Raises
+    ------
+    ValueError
+        If ``chunk_size`` is not a positive integer.
+    """
+    if chunk_size is not None and chunk_size < 1:
+        raise ValueError(f"chunk_size must be at least 1, but got {chunk_size}.")
+
+    def weights_and_unc(x_chunk: ArrayLike, xs_chunk: ArrayLike) -> Tuple[Any, Any]:
+        K, LK, LLK = jax.vmap(functools.partial(prepare_gram, ks))(x_chunk, xs_chunk)
+        weights, unc_base = unsymmetric_batched(
+            K=K, LK0=LK, LLK=LLK, noise_variance=noise_variance, cholesky=cholesky
+        )
+        return weights, unc_base
+
+    if chunk_size is None:
+        return weights_and_unc(x, xs)
+
+    # Pad the batch to a multiple of the chunk size by repeating the final neighbourhood.
+    num_batch = x.shape[0]
+    num_pad = -num_batch % chunk_size
+    x = jnp.pad(x, ((0, num_pad), (0, 0)), mode="edge")
+    xs = jnp.pad(xs, ((0, num_pad), (0, 0), (0, 0)), mode="edge")
+
+    x_chunks = x.reshape((-1, chunk_size) + x.shape[1:])
+    xs_chunks = xs.reshape((-1, chunk_size) + xs.shape[1:])
+    weights, unc_base = jax.lax.map(  # type: ignore[no-untyped-call]
+        lambda args: weights_and_unc(*args), (x_chunks, xs_chunks)
+    )
+    weights = weights.reshape((-1,) + weights.shape[2:])[:num_batch]
+    unc_base = unc_base.reshape((-1,))[:num_batch]
+    return weights, unc_base
+
+
 def prepare_gram(
     ks: Tuple[KernelFunctionLike, KernelFunctionLike, KernelFunctionLike],
     x: ArrayLike,
@@ -62,20 +140,22 @@ def prepare_gram(
         Triple of kernel Gram matrices (:math:`K`, :math:`LK`, :math:`L L^*K`) with shapes ``(n,n)``, ``(n,)``, ``()``.
     """
     k, lk, llk = ks
-    n = xs.shape[0]
-    K = k(xs, xs.T).reshape((n, n))
-    LK = lk(x[None, :], xs.T).reshape((n,))
-    LLK = llk(x[None, :], x[None, :].T).reshape(())
+    # The batched kernels return Gram matrices, so only the singleton
+    # axes that stem from the single evaluation point x need to be dropped.
+    K = k(xs, xs.T)
+    LK = lk(x[None, :], xs.T)[0]
+    LLK = llk(x[None, :], x[None, :].T)[0, 0]
     return K, LK, LLK
 
 
-@jax.jit
+@functools.partial(jax.jit, static_argnames=("cholesky",))
 def unsymmetric(
     *,
     K: ArrayLike,
     LK0: ArrayLike,
     LLK: ArrayLike,
     noise_variance: float,
+    cholesky: bool = False,
 ) -> Tuple[ArrayLike, ArrayLike]:
     r"""Unsymmetric collocation.
 
@@ -89,6 +169,10 @@ def unsymmetric(
         Gram matrix associated with :math:`L L^* k`. Shape ``()``.
     noise_variance
         Variance of the observation noise.
+    cholesky
+        Whether to solve the linear system with a Cholesky factorisation instead of an LU decomposition.
+        This is cheaper, but requires that the (noisy) Gram matrix is numerically positive definite,
+        which is often not the case for small noise variances and closely spaced grids.
 
     Returns
     -------
@@ -96,16 +180,70 @@ def unsymmetric(
         Weights and base-uncertainty. Shapes ``(n,n)``, ``(n,)``.
     """
 
-    noise_matrix = jnp.broadcast_to(
-        noise_variance * jnp.eye(K.shape[-1]), shape=K.shape
-    )
     LKt = _transpose(LK0)
-    weights_t = jnp.linalg.solve(K + noise_matrix, LKt)
+    K_noisy = _add_to_diagonal(K, noise_variance)
+    weights_t = _solve(K_noisy, LKt, cholesky=cholesky)
     weights = _transpose(weights_t)
     unc_base = LLK - weights @ LKt
     return weights, unc_base
 
 
+@functools.partial(jax.jit, static_argnames=("cholesky",))
+def unsymmetric_batched(
+    *,
+    K: ArrayLike,
+    LK0: ArrayLike,
+    LLK: ArrayLike,
+    noise_variance: float,
+    cholesky: bool = False,
+) -> Tuple[ArrayLike, ArrayLike]:
+    r"""Unsymmetric collocation for a batch of independent neighbourhoods.
+
+    Parameters
+    ----------
+    K
+        Gram matrices associated with :math:`k`. Shape ``(B,n,n)``.
+    LK0
+        Gram matrices associated with :math:`L k`. Shape ``(B,n)``.
+    LLK
+        Gram matrices associated with :math:`L L^* k`. Shape ``(B,)``.
+    noise_variance
+        Variance of the observation noise.
+    cholesky
+        Whether to solve the linear systems with Cholesky factorisations. See :func:`unsymmetric`.
+
+    Returns
+    -------
+    :
+        Weights and base-uncertainties. Shapes ``(B,n)``, ``(B,)``.
+    """
+    K_noisy = _add_to_diagonal(K, noise_variance)
+    weights = _solve(K_noisy, LK0[..., None], cholesky=cholesky)[..., 0]
+    unc_base = LLK - jnp.einsum("bn,bn->b", weights, LK0)
+    return weights, unc_base
+
+
+def _add_to_diagonal(A: ArrayLike, value: float) -> ArrayLike:
+    # Scatter-add into the diagonal instead of materialising a (scaled) identity matrix.
+    idx = jnp.arange(A.shape[-1])
+    return A.at[..., idx, idx].add(value)
+
+
+def _solve(A: ArrayLike, b: ArrayLike, *, cholesky: bool) -> ArrayLike:
+    if not cholesky:
+        return jnp.linalg.solve(A, b)
+
+    if b.ndim == 1:
+        return _solve(A, b[:, None], cholesky=True)[:, 0]
+
+    # Unlike jnp.linalg.solve, the triangular solves do not broadcast batch axes.
+    batch_shape = jnp.broadcast_shapes(A.shape[:-2], b.shape[:-2])
+    A = jnp.broadcast_to(A, shape=batch_shape + A.shape[-2:])
+    b = jnp.broadcast_to(b, shape=batch_shape + b.shape[-2:])
+    cho_factor = jax.scipy.linalg.cho_factor(A, lower=True)
+    return jax.scipy.linalg.cho_solve(cho_factor, b)
+
+
 def _transpose(LK0: ArrayLike) -> ArrayLike:
     if LK0.ndim > 1:
         LKt = jnp.swapaxes(LK0, -2, -1)
@@ -136,6 +274,7 @@ def symmetric(
     :
         Weights and base-uncertainty. Shapes ``(n,n)``, ``(n,)``.
     """
-    weights = jnp.linalg.solve(LLK + noise_variance * jnp.eye(*LLK.shape), LK1.T).T
+    LLK_noisy = _add_to_diagonal(LLK, noise_variance)
+    weights = jnp.linalg.solve(LLK_noisy, LK1.T).T
     unc_base = K - weights @ LK1.T
     return weights, unc_base
@@ -2,6 +2,7 @@
 
 import functools
 
+import jax
 import jax.numpy as jnp
 
 from probfindiff.typing import KernelFunctionLike
@@ -20,6 +21,14 @@ ORDER_METHOD = ORDER_METHOD_CENTRAL + 1
 """Order of non-central finite difference schemes."""
 
 
+@functools.lru_cache(maxsize=None)
 def kernel(*, min_order: int) -> KernelFunctionLike:
-    """Default kernel function."""
-    return functools.partial(kernel_zoo.polynomial, p=jnp.ones((min_order,)))
+    """Default kernel function.
+
+    The kernel is cached, so repeated calls with the same ``min_order``
+    return the same function. Its coefficients are concrete arrays
+    even if this function is called while tracing.
+    """
+    with jax.ensure_compile_time_eval():
+        p = jnp.ones((min_order,))
+    return functools.partial(kernel_zoo.polynomial, p=p)
@@ -6,6 +6,8 @@ from typing import Tuple, Union
 
 import jax
 import jax.numpy as jnp
+import numpy as np
+import scipy.spatial
 
 from probfindiff import defaults
 from probfindiff.typing import ArrayLike
@@ -61,6 +63,63 @@ def multivariate(
     return jnp.broadcast_to(coeffs, shape=shape_output + coeffs.shape)
 
 
+@functools.partial(jax.jit, static_argnames=("shape_input",))
+def multivariate_sparse(
+    *, xs_1d: ArrayLike, shape_input: Tuple[int]
+) -> Tuple[ArrayLike, ArrayLike]:
+    r"""Turn a univariate finite-difference stencil into a sparse multivariate stencil.
+
+    The dense stencil from :func:`multivariate` is zero everywhere
+    except along the axis of each partial derivative.
+    The sparse stencil stores only this axis and the nonzero offsets,
+    which reduces the memory from :math:`O(n^2c)` to :math:`O(nc)`.
+
+    Parameters
+    ----------
+    xs_1d
+        Input finite-difference grid/stencil in 1d.
+    shape_input
+        Input dimension of the to-be-differentiated function as a shape-tuple.
+        If the goal is the gradient of an `n`-dimensional function, ``shape_input=(n,)``.
+
+    Returns
+    -------
+    :
+        Axes and offsets of the new grid. Shapes ``(n, c)``, ``(n, c)``.
+        The ``j``-th point of the stencil of the ``i``-th partial derivative
+        is shifted by ``offsets[i, j]`` along the axis ``axes[i, j]``.
+
+
+    Examples
+    --------
+    >>> from probfindiff import central, differentiate
+    >>> scheme, xs_1d = central(dx=1.)
+    >>> axes, offsets = multivariate_sparse(xs_1d=xs_1d, shape_input=(2,))
+    >>> print(axes)
+    [[0 0 0]
+     [1 1 1]]
+    >>> print(offsets)
+    [[-1.  0.  1.]
+     [-1.  0.  1.]]
+
+    Evaluate a function on the shifted points and apply the scheme to get the gradient.
+
+    >>> f = lambda z: jnp.dot(z, z)
+    >>> x = jnp.array([1., 2.])
+    >>> f_shifted = lambda axis, offset: f(x.at[axis].add(offset))
+    >>> fx = jax.vmap(jax.vmap(f_shifted))(axes, offsets)
+    >>> dfx, _ = differentiate(fx, scheme=scheme)
+    >>> print(jnp.round(dfx, 1))
+    [2. 4.]
+    """
+    assert len(shape_input) == 1
+
+    (n,) = shape_input
+    axes = jnp.broadcast_to(jnp.arange(n)[:, None], shape=(n,) + xs_1d.shape)
+    offsets = jnp.broadcast_to(xs_1d[None, :], shape=(n,) + xs_1d.shape)
+    return axes, offsets
+
+
 @functools.partial(jax.jit, static_argnames=("shape_input",))
 def _stencils_for_all_partial_derivatives(
     *, stencil_1d: ArrayLike, shape_input: Tuple[int]
@@ -215,3 +274,71 @@ def central(
     offset = jnp.arange(-num_side, num_side + 1, step=1)
     grid = offset * dx
     return grid
+
+
+def nearest_neighbours(*, xs: ArrayLike, num: int) -> Tuple[ArrayLike, ArrayLike]:
+    """Find the nearest neighbours of each point in a point set.
+
+    The neighbours are computed with a KD-tree (:class:`scipy.spatial.cKDTree`)
+    that is queried in parallel, so this function cannot be JIT-compiled.
+    The neighbourhoods are gathered on the device and returned as JAX arrays.
+    The neighbour search is memoised for the most recent point sets.
+
+    Parameters
+    ----------
+    xs
+        Point set. Shape ``(n, d)``.
+    num
+        Number of neighbours per point (including the point itself).
+
+    Returns
+    -------
+    :
+        Neighbourhoods and the indices of the neighbours in ``xs``. Shapes ``(n, num, d)``, ``(n, num)``.
+
+    Raises
+    ------
+    ValueError
+        If ``num`` exceeds the number of points ``n``.
+
+    Examples
+    --------
+    >>> xs = jnp.array([0.0, 1.0, 3.0, 4.5])
+    >>> neighbours, indices = nearest_neighbours(xs=xs[:, None], num=2)
+    >>> print(neighbours.shape)
+    (4, 2, 1)
+    >>> print(indices)
+    [[0 1]
+     [1 0]
+     [2 3]
+     [3 2]]
+    """
+    xs_host = np.asarray(xs)
+    if num > xs_host.shape[0]:
+        raise ValueError(
+            f"Cannot find {num} neighbours in a set of {xs_host.shape[0]} points."
+        )
+    indices = _nearest_neighbour_indices(
+        xs_host.tobytes(), shape=xs_host.shape, dtype=xs_host.dtype.str, num=num
+    )
+
+    # Only the indices travel to the device; the gather happens there.
+    neighbours = jnp.take(jnp.asarray(xs), indices, axis=0)
+    return neighbours, indices
+
+
+@functools.lru_cache(maxsize=8)
+def _nearest_neighbour_indices(
+    xs_bytes: bytes, *, shape: Tuple[int, ...], dtype: str, num: int
+) -> ArrayLike:
+    """Query a KD-tree for the nearest neighbours of each point.
+
+    The point set is passed (and memoised) as raw bytes,
+    because arrays are not hashable.
+    Hashing the bytes is much cheaper than building and querying the tree,
+    so repeated calls on the same point set skip the neighbour search.
+    """
+    xs = np.frombuffer(xs_bytes, dtype=dtype).reshape(shape)
+    tree = scipy.spatial.cKDTree(data=xs)
+    _, indices = tree.query(x=xs, k=num, workers=-1)
+    return jnp.asarray(indices.reshape((shape[0], num)))
@@ -28,6 +28,30 @@ def derivative(fun: Callable[[Any], Any], **kwargs: Any) -> Callable[[Any], Any]
     return jax.jit(lambda *args: grad(*args)[0])
 
 
+def nth_derivative(
+    fun: Callable[[Any], Any], /, *, order: int, **kwargs: Any
+) -> Callable[[Any], Any]:
+    """Higher-order derivative of a scalar function.
+
+    Parameters
+    ----------
+    fun
+        Function to be differentiated.
+    order
+        Order of the derivative. If ``order=0``, the function is returned as is.
+    **kwargs
+        Keyword arguments to be passed down to :func:`jax.grad`.
+
+    Returns
+    -------
+    :
+        Differentiated function.
+    """
+    for _ in range(order):
+        fun = derivative(fun, **kwargs)
+    return fun
+
+
 def div(fun: Callable[[Any], Any], **kwargs: Any) -> Callable[[Any], Any]:
     """Divergence of a function as the trace of the Jacobian.
 
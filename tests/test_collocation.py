@@ -41,6 +41,23 @@ def test_unsymmetric(Ks, num_xs):
     assert unc_base.shape == (num_xs, num_xs)
 
 
+@pytest.mark.parametrize("num_xs", (1, 3))
+def test_unsymmetric_cholesky(Ks, num_xs):
+
+    K, LK, LLK = Ks
+    weights, unc_base = collocation.unsymmetric(
+        K=K, LK0=LK, LLK=LLK, noise_variance=0.1
+    )
+    weights_chol, unc_base_chol = collocation.unsymmetric(
+        K=K, LK0=LK, LLK=LLK, noise_variance=0.1, cholesky=True
+    )
+
+    assert weights_chol.shape == (num_xs, num_xs)
+    assert unc_base_chol.shape == (num_xs, num_xs)
+    assert jnp.allclose(weights_chol, weights)
+    assert jnp.allclose(unc_base_chol, unc_base)
+
+
 @pytest.mark.parametrize("num_xs", (1, 3))
 def test_symmetric(Ks, num_xs):
 
@@ -79,6 +96,50 @@ def test_batch_shape_correct():
     LK = lk_batch(zeros, ys.T)[None, ...]
     LLK = llk_batch(zeros, zeros.T)
 
-    weights, unc = collocation.unsymmetric(K=K, LK0=LK, LLK=LLK, noise_variance=1.0)
-    assert weights.shape == (1, d, 1, num_ys)
-    assert unc.shape == (d, d, 1, 1)
+    for cholesky in (False, True):
+        weights, unc = collocation.unsymmetric(
+            K=K, LK0=LK, LLK=LLK, noise_variance=1.0, cholesky=cholesky
+        )
+        assert weights.shape == (1, d, 1, num_ys)
+        assert unc.shape == (d, d, 1, 1)
+
+
+def test_non_uniform_nd_batched(ks):
+    x = jnp.zeros((4, 1))
+    xs = jnp.linspace(0.1, 1.0, num=4)[:, None, None] * jnp.arange(-1.0, 2.0)[:, None]
+
+    weights, unc_base = collocation.non_uniform_nd_batched(
+        x=x, xs=xs, ks=ks, noise_variance=1e-5
+    )
+    assert weights.shape == (4, 3)
+    assert unc_base.shape == (4,)
+
+    for i in range(4):
+        w, u = collocation.non_uniform_nd(x=x[i], xs=xs[i], ks=ks, noise_variance=1e-5)
+        assert jnp.allclose(weights[i], w, rtol=1e-4, atol=1e-4)
+        assert jnp.allclose(unc_base[i], u, rtol=1e-4, atol=1e-4)
+
+
+@pytest.mark.parametrize("chunk_size", (1, 2, 4))
+def test_non_uniform_nd_batched_chunks(ks, chunk_size):
+    x = jnp.zeros((5, 1))
+    xs = jnp.linspace(0.1, 1.0, num=5)[:, None, None] * jnp.arange(-1.0, 2.0)[:, None]
+
+    weights, unc_base = collocation.non_uniform_nd_batched(
+        x=x, xs=xs, ks=ks, noise_variance=1e-5
+    )
+    weights_chunked, unc_base_chunked = collocation.non_uniform_nd_batched(
+        x=x, xs=xs, ks=ks, noise_variance=1e-5, chunk_size=chunk_size
+    )
+    assert jnp.allclose(weights_chunked, weights, rtol=1e-4, atol=1e-4)
+    assert jnp.allclose(unc_base_chunked, unc_base, rtol=1e-4, atol=1e-4)
+
+
+@pytest.mark.parametrize("chunk_size", (0, -1))
+def test_non_uniform_nd_batched_invalid_chunk_size(ks, chunk_size):
+    x = jnp.zeros((5, 1))
+    xs = jnp.zeros((5, 3, 1))
+    with pytest.raises(ValueError):
+        collocation.non_uniform_nd_batched(
+            x=x, xs=xs, ks=ks, noise_variance=1e-5, chunk_size=chunk_size
+        )
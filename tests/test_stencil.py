@@ -1,6 +1,7 @@
 """Tests for stencil functionality."""
 
 import jax.numpy as jnp
+import pytest
 
 from probfindiff import stencil
 
@@ -9,3 +10,37 @@ def test_multivariate():
     xs_1d = jnp.arange(1, 4, dtype=float)
     xs = stencil.multivariate(xs_1d=xs_1d, shape_input=(7,), shape_output=(2,))
     assert xs.shape == (2, 7, 7, 3)
+
+
+def test_nearest_neighbours():
+    xs = jnp.arange(10.0).reshape((5, 2))
+    neighbours, indices = stencil.nearest_neighbours(xs=xs, num=3)
+    assert neighbours.shape == (5, 3, 2)
+    assert indices.shape == (5, 3)
+    assert jnp.allclose(neighbours[:, 0, :], xs)
+
+
+def test_nearest_neighbours_too_many_neighbours():
+    xs = jnp.arange(3.0)[:, None]
+    with pytest.raises(ValueError):
+        stencil.nearest_neighbours(xs=xs, num=5)
+
+
+def test_multivariate_sparse():
+    xs_1d = jnp.arange(1, 4, dtype=float)
+    axes, offsets = stencil.multivariate_sparse(xs_1d=xs_1d, shape_input=(7,))
+    assert axes.shape == offsets.shape == (7, 3)
+
+    xs = stencil.multivariate(xs_1d=xs_1d, shape_input=(7,))
+    xs_from_sparse = jnp.eye(7)[axes].transpose((0, 2, 1)) * offsets[:, None, :]
+    assert jnp.allclose(xs_from_sparse, xs)
+
+
+def test_nearest_neighbours_are_memoised():
+    xs = jnp.arange(12.0).reshape((4, 3))
+    _, indices1 = stencil.nearest_neighbours(xs=xs, num=2)
+    _, indices2 = stencil.nearest_neighbours(xs=xs, num=2)
+    assert indices1 is indices2
+
+    _, indices3 = stencil.nearest_neighbours(xs=xs + 1.0, num=2)
+    assert indices3 is not indices1
@@ -1,10 +1,13 @@
 """Tests for the top-level API."""
+import functools
+
 import jax
+import jax.experimental
 import jax.numpy as jnp
 import pytest_cases
 
 import probfindiff
-from probfindiff import collocation, stencil
+from probfindiff import collocation, defaults, stencil
 from probfindiff.utils import autodiff
 from probfindiff.utils import kernel as kernel_module
 from probfindiff.utils import kernel_zoo
@@ -120,3 +123,208 @@ def test_central_coefficients_polynomial():
 
     assert jnp.allclose(coeffs, jnp.array([1.0, -2.0, 1.0]))
     assert jnp.allclose(unc_base, 0.0)
+
+
+def test_differentiated_kernels_are_memoised(monkeypatch):
+    def k(x, y):
+        return kernel_zoo.exponentiated_quadratic(x, y, input_scale=4.0)
+
+    num_differentiations = 0
+
+    def differentiate_counted(**kwargs):
+        nonlocal num_differentiations
+        num_differentiations += 1
+        return differentiate(**kwargs)
+
+    differentiate = kernel_module.differentiate
+    monkeypatch.setattr(kernel_module, "differentiate", differentiate_counted)
+
+    xs = jnp.arange(-1.0, 2.0)
+    probfindiff.from_grid(xs=xs, kernel=k, order_derivative=2)
+    probfindiff.from_grid(xs=0.1 * xs, kernel=k, order_derivative=2)
+    assert num_differentiations == 1
+
+
+def test_default_kernel_is_cached():
+    assert defaults.kernel(min_order=3) is defaults.kernel(min_order=3)
+
+
+@pytest_cases.parametrize("kernel", [kernel_zoo.exponentiated_quadratic, None])
+def test_from_grid_batched(kernel):
+    xs = jnp.array([0.1, 0.2, 0.4])[:, None] * jnp.arange(-2.0, 3.0)[None, :]
+    scheme = probfindiff.from_grid_batched(xs=xs, kernel=kernel, noise_variance=1e-5)
+    assert scheme.weights.shape == (3, 5)
+    assert scheme.covs_marginal.shape == (3,)
+
+    dfx, _ = probfindiff.differentiate(jnp.sin(xs), scheme=scheme)
+    assert dfx.shape == (3,)
+
+    for i in range(3):
+        scheme_i = probfindiff.from_grid(xs=xs[i], kernel=kernel, noise_variance=1e-5)
+        assert jnp.allclose(scheme.weights[i], scheme_i.weights, rtol=1e-3, atol=1e-3)
+
+
+def test_from_grid_does_not_recompile(monkeypatch):
+    def kernel(x, y):
+        return kernel_zoo.exponentiated_quadratic(x, y, input_scale=3.0)
+
+    num_traces = 0
+
+    def non_uniform_nd_counted(**kwargs):
+        nonlocal num_traces
+        num_traces += 1
+        return non_uniform_nd(**kwargs)
+
+    non_uniform_nd = collocation.non_uniform_nd
+    monkeypatch.setattr(collocation, "non_uniform_nd", non_uniform_nd_counted)
+
+    xs = jnp.arange(-1.0, 2.0)
+    probfindiff.from_grid(xs=xs, kernel=kernel)
+    assert num_traces == 1
+
+    probfindiff.from_grid(xs=0.1 * xs, kernel=kernel)
+    assert num_traces == 1
+
+
+def test_schemes_are_memoised():
+    scheme1, xs1 = probfindiff.central(dx=0.1)
+    scheme2, xs2 = probfindiff.central(dx=0.1)
+    assert scheme1 is scheme2
+    assert xs1 is xs2
+
+
+def test_schemes_with_traced_step_size():
+    @jax.jit
+    def weights(dx):
+        scheme, _ = probfindiff.central(dx=dx)
+        return scheme.weights
+
+    assert jnp.allclose(weights(0.1), probfindiff.central(dx=0.1)[0].weights)
+
+
+@pytest_cases.parametrize("fd", [probfindiff.backward, probfindiff.forward])
+@pytest_cases.parametrize("order_derivative, order_method", [(1, 2), (1, 3), (2, 2)])
+def test_closed_form_schemes_match_collocation(fd, order_derivative, order_method):
+    scheme, xs = fd(
+        dx=0.5,
+        order_derivative=order_derivative,
+        order_method=order_method,
+        noise_variance=0.0,
+    )
+    scheme_solve = probfindiff.from_grid(
+        xs=xs, order_derivative=order_derivative, noise_variance=0.0
+    )
+    assert jnp.allclose(scheme.weights, scheme_solve.weights, rtol=1e-3, atol=1e-3)
+    assert jnp.allclose(scheme.covs_marginal, 0.0)
+
+
+@pytest_cases.parametrize("order_derivative", [1, 2])
+def test_closed_form_central_schemes_match_collocation(order_derivative):
+    scheme, xs = probfindiff.central(
+        dx=0.5, order_derivative=order_derivative, noise_variance=0.0
+    )
+    scheme_solve = probfindiff.from_grid(
+        xs=xs, order_derivative=order_derivative, noise_variance=0.0
+    )
+    assert jnp.allclose(scheme.weights, scheme_solve.weights, rtol=1e-3, atol=1e-3)
+
+
+@pytest_cases.parametrize_with_cases("scheme, xs", cases=".")
+def test_differentiate_precision(scheme, xs):
+    fx = jnp.sin(xs)
+    dfx, _ = probfindiff.differentiate(fx, scheme=scheme)
+    dfx_highest, _ = probfindiff.differentiate(
+        fx, scheme=scheme, precision=jax.lax.Precision.HIGHEST
+    )
+    assert jnp.allclose(dfx_highest, dfx)
+
+
+def test_schemes_share_differentiated_kernels(monkeypatch):
+    def k(x, y):
+        return kernel_zoo.exponentiated_quadratic(x, y, input_scale=2.0)
+
+    num_differentiations = 0
+
+    def differentiate_counted(**kwargs):
+        nonlocal num_differentiations
+        num_differentiations += 1
+        return differentiate(**kwargs)
+
+    differentiate = kernel_module.differentiate
+    monkeypatch.setattr(kernel_module, "differentiate", differentiate_counted)
+
+    for fd in (probfindiff.backward, probfindiff.forward, probfindiff.central):
+        fd(dx=0.1, kernel=k)
+    assert num_differentiations == 1
+
+
+def test_finalize():
+    schemes = (probfindiff.backward(dx=0.1), probfindiff.central(dx=0.1))
+    (scheme1, xs1), (scheme2, xs2) = probfindiff.finalize(*schemes)
+    assert jnp.allclose(scheme1.weights, schemes[0][0].weights)
+    assert jnp.allclose(xs1, schemes[0][1])
+    assert jnp.allclose(scheme2.weights, schemes[1][0].weights)
+    assert jnp.allclose(xs2, schemes[1][1])
+
+
+def test_finalize_single_scheme():
+    scheme, xs = probfindiff.finalize(probfindiff.central(dx=0.1))
+    assert isinstance(scheme, probfindiff.FiniteDifferenceScheme)
+    assert jnp.allclose(xs, probfindiff.central(dx=0.1)[1])
+
+
+def test_schemes_memoised_while_tracing_are_concrete():
+    @jax.jit
+    def dfx(x):
+        scheme, xs = probfindiff.central(dx=0.3)
+        return probfindiff.differentiate(jnp.sin(x + xs), scheme=scheme)[0]
+
+    assert jnp.allclose(dfx(1.0), jnp.cos(1.0), atol=1e-1)
+
+    scheme, xs = probfindiff.central(dx=0.3)
+    assert not isinstance(scheme.weights, jax.core.Tracer)
+    assert not isinstance(xs, jax.core.Tracer)
+
+
+def test_schemes_with_traced_kernel_are_not_memoised():
+    def loss(input_scale):
+        k = functools.partial(
+            kernel_zoo.exponentiated_quadratic, input_scale=input_scale
+        )
+        scheme1, _ = probfindiff.central(dx=0.1, kernel=k)
+        scheme2, _ = probfindiff.central(dx=0.1, kernel=k)
+        assert scheme1 is not scheme2
+        return jnp.sum(scheme1.weights**2)
+
+    assert jnp.isfinite(jax.grad(loss)(1.0))
+
+
+def test_memoised_schemes_respect_double_precision():
+    with jax.experimental.enable_x64():
+        _, xs = probfindiff.central(dx=0.1)
+        _, xs_perturbed = probfindiff.central(dx=0.1 + 1e-9)
+        assert xs.dtype == jnp.float64
+        assert xs[-1] == 0.1
+        assert xs_perturbed[-1] == 0.1 + 1e-9
+
+    _, xs = probfindiff.central(dx=0.1)
+    assert xs.dtype == jnp.float32
+
+
+@pytest_cases.parametrize("dx", [1e-13, 2.5e-12])
+def test_memoised_schemes_keep_small_step_sizes(dx):
+    _, xs = probfindiff.central(dx=dx)
+    assert jnp.allclose(xs[-1], dx, rtol=1e-6, atol=0.0)
+
+
+@pytest_cases.parametrize("order_derivative", [1, 2])
+def test_default_central_schemes_are_close_to_closed_form(order_derivative):
+    """The default noise variance is not zero, so collocation is used and approximates the closed form."""
+    scheme, _ = probfindiff.central(dx=0.5, order_derivative=order_derivative)
+    scheme_closed_form, _ = probfindiff.central(
+        dx=0.5, order_derivative=order_derivative, noise_variance=0.0
+    )
+    assert jnp.allclose(
+        scheme.weights, scheme_closed_form.weights, rtol=1e-3, atol=1e-3
+    )
+    assert jnp.allclose(scheme.covs_marginal, 0.0, atol=1e-4)
@@ -1,5 +1,6 @@
 """Tests for differential operators."""
 
+import jax.numpy as jnp
 import pytest_cases
 
 from probfindiff.utils import autodiff
@@ -20,3 +21,9 @@ def case_laplace():
 @pytest_cases.parametrize_with_cases("D", cases=".")
 def test_diff(D):
     D(lambda x, y: y + x**2, argnums=0)
+
+
+@pytest_cases.parametrize("order, expected", [(0, 8.0), (1, 12.0), (3, 6.0)])
+def test_nth_derivative(order, expected):
+    D = autodiff.nth_derivative(lambda x: x[0] ** 3, order=order)
+    assert jnp.allclose(D(jnp.array([2.0])), expected)